@@ -15,13 +15,30 @@ Example:
   "bmi": 36.6,
   "smoking_status": "formerly smoked"
 }
+
+/predict_batch takes a JSON list of the same objects.
+
+High-volume clients can instead POST a packed columnar buffer to /predict or
+/predict_batch with Content-Type: application/x-stroke-packed (format in
+src/packed_protocol.py, category codes from GET /schema). The response is
+the raw little-endian float32 probabilities, one per row.
+
+Concurrent identical requests share one computation, and duplicate rows in
+a batch are scored once; GET /stats reports how many were coalesced.
 """
+from typing import List
 import joblib
+import numpy as np
 import pandas as pd
 import tensorflow as tf
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
 from pydantic import BaseModel
 
+from src.coalesce import SingleFlight, payload_key
+from src.packed_protocol import MEDIA_TYPE, PackedDecoder, PackedFormatError, category_table
+
 app = FastAPI(title="Stroke Risk Prediction API")
 
 MODELS_DIR = "models"
@@ -30,6 +47,27 @@ MODEL_PATH = f"{MODELS_DIR}/stroke_dnn.h5"
 
 preproc = joblib.load(PREPROC_PATH)
 model = tf.keras.models.load_model(MODEL_PATH)
+packed_decoder = PackedDecoder(preproc)
+coalescer = SingleFlight()
+
+# packed bodies are routed to their own handlers so the JSON path is untouched
+PACKED_ROUTES = {"/predict": "/predict/packed", "/predict_batch": "/predict_batch/packed"}
+
+class PackedRouter:
+    """Plain ASGI middleware: only rewrites the path of packed requests."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"] in PACKED_ROUTES:
+            for name, value in scope["headers"]:
+                if name == b"content-type" and value.split(b";")[0].strip() == MEDIA_TYPE.encode():
+                    scope = dict(scope, path=PACKED_ROUTES[scope["path"]])
+                    break
+        await self.app(scope, receive, send)
+
+app.add_middleware(PackedRouter)
 
 class InputData(BaseModel):
     gender: str
@@ -43,9 +81,55 @@ class InputData(BaseModel):
     bmi: float
     smoking_status: str
 
-@app.post("/predict")
-def predict(payload: InputData):
+def predict_one(payload: InputData):
     df = pd.DataFrame([payload.dict()])
     X = preproc.transform(df)
-    proba = float(model.predict(X).ravel()[0])
+    return float(model.predict(X).ravel()[0])
+
+@app.post("/predict")
+def predict(payload: InputData):
+    proba = coalescer.do(payload_key(payload), lambda: predict_one(payload))
     return {"stroke_risk_probability": proba}
+
+@app.post("/predict_batch")
+def predict_batch(payload: List[InputData]):
+    if not payload:
+        raise HTTPException(status_code=400, detail="unexpected row count: 0")
+    first, inverse = coalescer.dedupe([payload_key(p) for p in payload])
+    df = pd.DataFrame([payload[i].dict() for i in first])
+    X = preproc.transform(df)
+    proba = model.predict(X, verbose=0).ravel()[inverse]
+    return {"stroke_risk_probabilities": [float(p) for p in proba]}
+
+@app.get("/stats")
+def stats():
+    return coalescer.stats()
+
+@app.get("/schema")
+def schema():
+    return {"media_type": MEDIA_TYPE, "categories": category_table(preproc)}
+
+def predict_packed_body(body: bytes, single: bool) -> bytes:
+    try:
+        X = packed_decoder.decode(body)
+    except PackedFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if X.shape[0] == 0 or (single and X.shape[0] != 1):
+        raise HTTPException(status_code=400, detail=f"unexpected row count: {X.shape[0]}")
+    X_unique, inverse = np.unique(X, axis=0, return_inverse=True)
+    if not single:
+        coalescer.record_batch(X.shape[0], X_unique.shape[0])
+    proba = model.predict(X_unique, verbose=0).ravel()[inverse.ravel()].astype("<f4")
+    return proba.tobytes()
+
+@app.post("/predict/packed", include_in_schema=False)
+async def predict_packed(request: Request):
+    # a single-row packed body is its own canonical key
+    body = await request.body()
+    content = await run_in_threadpool(coalescer.do, body, lambda: predict_packed_body(body, True))
+    return Response(content=content, media_type=MEDIA_TYPE)
+
+@app.post("/predict_batch/packed", include_in_schema=False)
+async def predict_batch_packed(request: Request):
+    content = await run_in_threadpool(predict_packed_body, await request.body(), False)
+    return Response(content=content, media_type=MEDIA_TYPE)
@@ -1,14 +1,39 @@
 # src/app_simple.py
 """
 Simplified FastAPI app with better TensorFlow error handling
+
+Predictions degrade in tiers, and every response says which one answered
+in "method":
+  - "tensorflow_model": the DNN
+  - "fallback_model":   the logistic-regression fallback (models/fallback_lr.pkl),
+                        used when TensorFlow is unavailable, when more than
+                        MAX_DNN_INFLIGHT DNN calls are already running, when
+                        the DNN misses its DNN_LATENCY_BUDGET_MS budget, or
+                        when the DNN raises an error
+  - "simple_heuristic": hand-tuned scores, only if the DNN can't answer and
+                        the fallback model isn't loaded
+If FIRST_STAGE_THRESHOLD is set, the fallback runs first and requests it
+scores below the threshold are answered without calling the DNN.
+
+Both models are trained on the same SMOTE-resampled data, so their
+probabilities share one (inflated, not prevalence-calibrated) scale and
+FIRST_STAGE_THRESHOLD is read on that scale too.
+
+Concurrent requests with identical payloads share one prediction
+(see src/coalesce.py); /health reports how many were coalesced.
 """
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
 import joblib
+import numpy as np
 import pandas as pd
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 import logging
 
+from src.coalesce import SingleFlight, payload_key
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -18,6 +43,18 @@ app = FastAPI(title="Stroke Risk Prediction API - Simple Version")
 # Global variables for model components
 preproc = None
 model = None
+fallback_model = None
+
+# Degradation settings
+DNN_LATENCY_BUDGET_MS = float(os.environ.get("DNN_LATENCY_BUDGET_MS", "200"))
+MAX_DNN_INFLIGHT = int(os.environ.get("MAX_DNN_INFLIGHT", "4"))
+FIRST_STAGE_THRESHOLD = os.environ.get("FIRST_STAGE_THRESHOLD")
+FIRST_STAGE_THRESHOLD = float(FIRST_STAGE_THRESHOLD) if FIRST_STAGE_THRESHOLD else None
+
+dnn_executor = ThreadPoolExecutor(max_workers=MAX_DNN_INFLIGHT)
+dnn_inflight = 0
+dnn_inflight_lock = threading.Lock()
+coalescer = SingleFlight()
 
 # Load preprocessor at startup
 try:
@@ -35,12 +72,24 @@ try:
     tf.config.set_visible_devices([], 'GPU')
     
     MODEL_PATH = f"{MODELS_DIR}/stroke_dnn.h5"
-    model = tf.keras.models.load_model(MODEL_PATH)
+    loaded_model = tf.keras.models.load_model(MODEL_PATH)
+    # warm up so the first request doesn't pay graph tracing against the latency budget;
+    # only publish the model once it has produced a prediction
+    loaded_model.predict(np.zeros((1, loaded_model.input_shape[1])), verbose=0)
+    model = loaded_model
     logger.info("TensorFlow model loaded successfully")
 except Exception as e:
     logger.error(f"Failed to load TensorFlow model: {e}")
     logger.info("API will run in preprocessor-only mode")
 
+# Lightweight fallback model (no TensorFlow needed)
+try:
+    FALLBACK_PATH = f"{MODELS_DIR}/fallback_lr.pkl"
+    fallback_model = joblib.load(FALLBACK_PATH)
+    logger.info("Fallback model loaded successfully")
+except Exception as e:
+    logger.error(f"Failed to load fallback model: {e}")
+
 class InputData(BaseModel):
     gender: str
     age: float
@@ -59,7 +108,8 @@ def root():
         "message": "Stroke Risk Prediction API",
         "status": "running",
         "preprocessor_loaded": preproc is not None,
-        "model_loaded": model is not None
+        "model_loaded": model is not None,
+        "fallback_model_loaded": fallback_model is not None
     }
 
 @app.get("/health")
@@ -67,43 +117,100 @@ def health_check():
     return {
         "status": "healthy",
         "preprocessor": "loaded" if preproc else "failed",
-        "model": "loaded" if model else "failed"
+        "model": "loaded" if model else "failed",
+        "fallback_model": "loaded" if fallback_model else "failed",
+        "coalescing": coalescer.stats()
+    }
+
+def run_dnn(X):
+    global dnn_inflight
+    try:
+        return float(model.predict(X, verbose=0).ravel()[0])
+    finally:
+        with dnn_inflight_lock:
+            dnn_inflight -= 1
+
+def predict_dnn_within_budget(X):
+    """
+    Run the DNN unless it is overloaded, too slow or failing.
+    Returns (probability, None) on success or (None, reason) otherwise.
+    """
+    global dnn_inflight
+    with dnn_inflight_lock:
+        if dnn_inflight >= MAX_DNN_INFLIGHT:
+            return None, "DNN overloaded"
+        dnn_inflight += 1
+
+    future = dnn_executor.submit(run_dnn, X)
+    try:
+        return future.result(timeout=DNN_LATENCY_BUDGET_MS / 1000), None
+    except FutureTimeout:
+        # the call keeps its in-flight slot until it finishes
+        return None, f"DNN exceeded {DNN_LATENCY_BUDGET_MS:g} ms latency budget"
+    except Exception as e:
+        logger.error(f"DNN prediction failed: {e}")
+        return None, f"DNN failed: {e}"
+
+def fallback_response(proba, note):
+    return {
+        "stroke_risk_probability": proba,
+        "risk_percentage": f"{proba:.2%}",
+        "method": "fallback_model",
+        "note": note
     }
 
 @app.post("/predict")
 def predict(payload: InputData):
     if preproc is None:
         raise HTTPException(status_code=500, detail="Preprocessor not loaded")
-    
+
+    return coalescer.do(payload_key(payload), lambda: predict_tiered(payload))
+
+def predict_tiered(payload: InputData):
     try:
         # Convert to DataFrame and preprocess
         df = pd.DataFrame([payload.dict()])
         X = preproc.transform(df)
-        
+
+        fallback_proba = None
+        if fallback_model is not None and FIRST_STAGE_THRESHOLD is not None:
+            fallback_proba = float(fallback_model.predict_proba(X)[0, 1])
+            if fallback_proba < FIRST_STAGE_THRESHOLD:
+                return fallback_response(fallback_proba, "Low risk screened by first-stage model")
+
         if model is not None:
             # Make prediction with TensorFlow model
-            proba = float(model.predict(X, verbose=0).ravel()[0])
-            return {
-                "stroke_risk_probability": proba,
-                "risk_percentage": f"{proba:.2%}",
-                "method": "tensorflow_model"
-            }
+            proba, reason = predict_dnn_within_budget(X)
+            if proba is not None:
+                return {
+                    "stroke_risk_probability": proba,
+                    "risk_percentage": f"{proba:.2%}",
+                    "method": "tensorflow_model"
+                }
         else:
-            # Fallback: Simple risk calculation based on known risk factors
-            risk_score = calculate_simple_risk(payload)
-            return {
-                "stroke_risk_probability": risk_score,
-                "risk_percentage": f"{risk_score:.2%}",
-                "method": "simple_heuristic",
-                "note": "TensorFlow model unavailable, using heuristic approach"
-            }
+            reason = "TensorFlow model unavailable"
+
+        if fallback_model is not None:
+            if fallback_proba is None:
+                fallback_proba = float(fallback_model.predict_proba(X)[0, 1])
+            return fallback_response(fallback_proba, f"{reason}, using fallback model")
+
+        # Last resort: Simple risk calculation based on known risk factors
+        risk_score = calculate_simple_risk(payload)
+        return {
+            "stroke_risk_probability": risk_score,
+            "risk_percentage": f"{risk_score:.2%}",
+            "method": "simple_heuristic",
+            "note": f"{reason}, using heuristic approach"
+        }
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
 def calculate_simple_risk(data: InputData):
     """
-    Simple heuristic risk calculation when TensorFlow model is unavailable
+    Simple heuristic risk calculation when neither the TensorFlow model
+    nor the fallback model is available
     """
     risk = 0.1  # Base risk
     
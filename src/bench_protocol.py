@@ -0,0 +1,60 @@
+# src/bench_protocol.py
+"""
+Compare the JSON and packed request paths of src/app.py: server-side CPU
+time to turn a request body into the feature matrix, and bytes on the wire.
+The model call is identical for both paths and is left out of the timing.
+
+Run from the project root:
+    python -m src.bench_protocol
+"""
+import json
+import time
+import numpy as np
+import pandas as pd
+
+from src.app import InputData, packed_decoder, preproc
+from src.packed_protocol import category_table, encode_rows
+
+BATCH_SIZES = [1, 32, 256, 1024]
+REPEATS = 50
+
+def load_records(n):
+    df = pd.read_csv("data/healthcare-dataset-stroke-data.csv")
+    # InputData.bmi is required, so rows with missing bmi can't go over JSON
+    df = df.drop(columns=["id", "stroke"]).dropna(subset=["bmi"])
+    df = df.sample(n=n, replace=True, random_state=42)
+    return df.to_dict(orient="records")
+
+def decode_json(body):
+    rows = [InputData(**rec).dict() for rec in json.loads(body)]
+    return preproc.transform(pd.DataFrame(rows))
+
+def cpu_per_call(fn, body):
+    fn(body)  # warm up
+    start = time.process_time()
+    for _ in range(REPEATS):
+        fn(body)
+    return (time.process_time() - start) / REPEATS
+
+def main():
+    categories = category_table(preproc)
+    print(f"{'rows':>6} {'json bytes':>11} {'packed bytes':>13} "
+          f"{'json cpu ms':>12} {'packed cpu ms':>14} {'speedup':>8} {'max |dX|':>9}")
+    for n in BATCH_SIZES:
+        records = load_records(n)
+        json_body = json.dumps(records).encode()
+        packed_body = encode_rows(records, categories)
+
+        # both paths must produce the same features (up to float32 rounding)
+        max_diff = np.abs(decode_json(json_body) - packed_decoder.decode(packed_body)).max()
+
+        t_json = cpu_per_call(decode_json, json_body)
+        t_packed = cpu_per_call(packed_decoder.decode, packed_body)
+        print(f"{n:>6} {len(json_body):>11} {len(packed_body):>13} "
+              f"{t_json * 1e3:>12.3f} {t_packed * 1e3:>14.3f} "
+              f"{t_json / t_packed:>7.1f}x {max_diff:>9.1e}")
+
+    print("\nResponses: JSON floats vs 4 bytes per row (float32) for packed.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# src/coalesce.py
+"""
+Request coalescing for the prediction endpoints.
+
+`SingleFlight.do(key, fn)` runs `fn` once per key at a time: concurrent
+callers with the same key wait for the in-flight call and all receive its
+result (or its exception). Nothing is cached after the call finishes.
+
+`SingleFlight.dedupe(keys)` does the same within one batch, so each unique
+row is preprocessed and scored only once.
+"""
+import threading
+
+
+def payload_key(payload):
+    """Canonical, hashable key for an InputData payload."""
+    return tuple(sorted(payload.dict().items()))
+
+
+def _copy_error(error):
+    """
+    Fresh instance of `error` for a follower to raise, so waiting threads
+    don't all append their tracebacks to the leader's exception object.
+    Built without __init__ since e.g. HTTPException needs keyword arguments.
+    """
+    clone = type(error).__new__(type(error))
+    clone.__dict__.update(error.__dict__)
+    clone.args = error.args
+    return clone
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.batch_rows = 0
+        self.batch_rows_deduped = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            self.requests += 1
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _copy_error(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+            call.done.set()
+
+    def dedupe(self, keys):
+        """
+        Returns (first, inverse): `first` holds the index of the first row
+        for each unique key, and unique result j belongs to every row i with
+        inverse[i] == j.
+        """
+        index = {}
+        first = []
+        inverse = []
+        for i, key in enumerate(keys):
+            j = index.get(key)
+            if j is None:
+                j = index[key] = len(first)
+                first.append(i)
+            inverse.append(j)
+        self.record_batch(len(inverse), len(first))
+        return first, inverse
+
+    def record_batch(self, rows, unique_rows):
+        """Count a batch deduplicated elsewhere (e.g. with np.unique)."""
+        with self._lock:
+            self.batch_rows += rows
+            self.batch_rows_deduped += rows - unique_rows
+
+    def stats(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "coalesced_requests": self.coalesced,
+                "inflight": len(self._inflight),
+                "batch_rows": self.batch_rows,
+                "batch_rows_deduped": self.batch_rows_deduped,
+            }
@@ -1,18 +1,33 @@
 # src/evaluate.py
 """
 Load saved model and test split, produce metrics and a small report.
+The logistic-regression fallback is evaluated on the same split, with
+single-row latency measured for both models.
 """
 import os
+import time
 import numpy as np
 import joblib
 import tensorflow as tf
-from sklearn.metrics import roc_auc_score, classification_report, confusion_matrix, precision_recall_fscore_support
+from sklearn.metrics import roc_auc_score, brier_score_loss, classification_report, confusion_matrix, precision_recall_fscore_support
 
 BASE_DIR = os.path.join(os.path.dirname(__file__), "..")
 MODELS_DIR = os.path.join(BASE_DIR, "models")
 MODEL_PATH = os.path.join(MODELS_DIR, "stroke_dnn.h5")
+FALLBACK_PATH = os.path.join(MODELS_DIR, "fallback_lr.pkl")
 TESTDATA_PATH = os.path.join(MODELS_DIR, "test_data.npz")
 
+LATENCY_ROWS = 200
+
+def single_row_latency_ms(predict_fn, X):
+    # median wall time of one-row predictions, i.e. what a /predict request pays
+    times = []
+    for row in X[:LATENCY_ROWS]:
+        start = time.perf_counter()
+        predict_fn(row.reshape(1, -1))
+        times.append(time.perf_counter() - start)
+    return float(np.median(times)) * 1e3
+
 def main():
     # load model and test data
     model = tf.keras.models.load_model(MODEL_PATH)
@@ -38,5 +53,25 @@ def main():
     print("\nPrecision, Recall, F1, Support:")
     print(prfs)
 
+    if not os.path.exists(FALLBACK_PATH):
+        print(f"\nFallback model not found at {FALLBACK_PATH}, run train_fallback.py to create it")
+        return
+
+    # fallback vs DNN: quality gap and latency gap
+    fallback = joblib.load(FALLBACK_PATH)
+    fb_proba = fallback.predict_proba(X_test)[:, 1]
+    fb_auc = roc_auc_score(y_test, fb_proba)
+
+    dnn_ms = single_row_latency_ms(lambda x: model.predict(x, verbose=0), X_test)
+    fb_ms = single_row_latency_ms(fallback.predict_proba, X_test)
+
+    print("\nDNN vs fallback (logistic regression):")
+    print(f"{'':<10} {'ROC AUC':>8} {'Brier':>8} {'1-row ms':>9}")
+    print(f"{'dnn':<10} {auc:>8.4f} {brier_score_loss(y_test, y_proba):>8.4f} {dnn_ms:>9.3f}")
+    print(f"{'fallback':<10} {fb_auc:>8.4f} {brier_score_loss(y_test, fb_proba):>8.4f} {fb_ms:>9.3f}")
+    print(f"AUC gap (dnn - fallback): {auc - fb_auc:+.4f}, speedup: {dnn_ms / fb_ms:.1f}x")
+    print("Note: both models are trained on SMOTE-resampled data, so their probabilities "
+          "are inflated relative to real prevalence; Brier compares them on that shared scale.")
+
 if __name__ == "__main__":
     main()
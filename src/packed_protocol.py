@@ -0,0 +1,129 @@
+# src/packed_protocol.py
+"""
+Compact binary ("packed") request format for high-volume clients.
+
+Instead of one JSON object per patient, a client sends a single columnar
+buffer (all values little-endian):
+
+    magic            4 bytes   b"SRP1"
+    n_rows           uint32
+    age              float32[n_rows]
+    avg_glucose_level float32[n_rows]   (NaN = missing, median-imputed)
+    bmi              float32[n_rows]    (NaN = missing, median-imputed)
+    gender           uint8[n_rows]      category code
+    hypertension     uint8[n_rows]      category code
+    ...one uint8 array per remaining categorical column, in CAT_COLS order
+
+Category codes are indexes into the categories learned by the fitted
+preprocessor (see `category_table`). Code 255 (or any out-of-range code)
+means unknown and encodes to all-zero one-hot columns, the same as the
+JSON path does with handle_unknown="ignore".
+
+The buffer is decoded with numpy straight into the preprocessed feature
+matrix, so no DataFrame or per-row Python objects are built on the server.
+"""
+import struct
+import numpy as np
+
+MEDIA_TYPE = "application/x-stroke-packed"
+MAGIC = b"SRP1"
+HEADER = struct.Struct("<4sI")
+UNKNOWN_CODE = 255
+
+# column layout of preprocess.build_preprocessor(); PackedDecoder checks the
+# fitted preprocessor against it so a mismatch fails at startup
+NUM_COLS = ["age", "avg_glucose_level", "bmi"]
+CAT_COLS = [
+    "gender",
+    "hypertension",
+    "heart_disease",
+    "ever_married",
+    "work_type",
+    "Residence_type",
+    "smoking_status",
+]
+
+
+class PackedFormatError(ValueError):
+    """Raised when a packed buffer is malformed."""
+
+
+def category_table(preproc):
+    """Return {column: [categories...]} so clients can build codes."""
+    ohe = preproc.named_transformers_["cat"].named_steps["ohe"]
+    return {
+        col: [c.item() if hasattr(c, "item") else c for c in cats]
+        for col, cats in zip(CAT_COLS, ohe.categories_)
+    }
+
+
+class PackedDecoder:
+    """
+    Turns packed buffers into the same matrix `preproc.transform` produces.
+    Imputer/scaler statistics and one-hot offsets are read once from the
+    fitted preprocessor.
+    """
+
+    def __init__(self, preproc):
+        # the wire format and one-hot offsets assume this exact column layout
+        fitted = [(name, list(cols)) for name, _, cols in preproc.transformers_ if name != "remainder"]
+        if fitted != [("num", NUM_COLS), ("cat", CAT_COLS)]:
+            raise ValueError(f"preprocessor columns {fitted} do not match the packed format")
+
+        num = preproc.named_transformers_["num"].named_steps
+        self.medians = num["imputer"].statistics_.astype(np.float64)
+        self.means = num["scaler"].mean_.astype(np.float64)
+        self.scales = num["scaler"].scale_.astype(np.float64)
+
+        ohe = preproc.named_transformers_["cat"].named_steps["ohe"]
+        self.cat_sizes = np.array([len(c) for c in ohe.categories_], dtype=np.int64)
+        self.cat_offsets = len(NUM_COLS) + np.concatenate(([0], np.cumsum(self.cat_sizes)[:-1]))
+        self.n_features = len(NUM_COLS) + int(self.cat_sizes.sum())
+
+    def decode(self, buf):
+        if len(buf) < HEADER.size:
+            raise PackedFormatError("buffer shorter than header")
+        magic, n = HEADER.unpack_from(buf, 0)
+        if magic != MAGIC:
+            raise PackedFormatError(f"bad magic {magic!r}")
+        expected = HEADER.size + n * (4 * len(NUM_COLS) + len(CAT_COLS))
+        if len(buf) != expected:
+            raise PackedFormatError(f"expected {expected} bytes for {n} rows, got {len(buf)}")
+
+        num_bytes = n * 4 * len(NUM_COLS)
+        num = np.frombuffer(buf, dtype="<f4", count=n * len(NUM_COLS), offset=HEADER.size)
+        num = num.reshape(len(NUM_COLS), n).T.astype(np.float64)
+        num = np.where(np.isnan(num), self.medians, num)
+
+        codes = np.frombuffer(buf, dtype=np.uint8, count=n * len(CAT_COLS),
+                              offset=HEADER.size + num_bytes)
+        codes = codes.reshape(len(CAT_COLS), n).T.astype(np.int64)
+
+        X = np.zeros((n, self.n_features), dtype=np.float64)
+        X[:, :len(NUM_COLS)] = (num - self.means) / self.scales
+
+        # one-hot: set a single column per (row, categorical) where the code is known
+        known = codes < self.cat_sizes
+        rows, cols = np.nonzero(known)
+        X[rows, self.cat_offsets[cols] + codes[rows, cols]] = 1.0
+        return X
+
+
+def encode_rows(records, categories):
+    """
+    Client-side helper: pack a list of raw feature dicts (the JSON payload
+    shape) into a buffer. `categories` is the output of `category_table`.
+    """
+    n = len(records)
+    lookup = {col: {c: i for i, c in enumerate(cats)} for col, cats in categories.items()}
+
+    num = np.empty((len(NUM_COLS), n), dtype="<f4")
+    codes = np.empty((len(CAT_COLS), n), dtype=np.uint8)
+    for i, rec in enumerate(records):
+        for j, col in enumerate(NUM_COLS):
+            value = rec.get(col)
+            num[j, i] = np.nan if value is None else value
+        for j, col in enumerate(CAT_COLS):
+            codes[j, i] = lookup[col].get(rec.get(col), UNKNOWN_CODE)
+
+    return HEADER.pack(MAGIC, n) + num.tobytes() + codes.tobytes()
@@ -1,12 +1,14 @@
 # src/train_dnn.py
 """
 Train a simple MLP (DNN) for stroke prediction using the preprocessor saved
-by preprocess.py. Saves trained model and test-split for evaluation.
+by preprocess.py. Also trains a logistic-regression fallback on the same
+split. Saves both models and the test-split for evaluation.
 """
 import os
 import numpy as np
 import pandas as pd
 import joblib
+from sklearn.linear_model import LogisticRegression
 from sklearn.model_selection import train_test_split
 from imblearn.over_sampling import SMOTE
 import tensorflow as tf
@@ -18,6 +20,7 @@ MODELS_DIR = os.path.join(BASE_DIR, "models")
 os.makedirs(MODELS_DIR, exist_ok=True)
 PREPROC_PATH = os.path.join(MODELS_DIR, "preprocessor.pkl")
 MODEL_PATH = os.path.join(MODELS_DIR, "stroke_dnn.h5")
+FALLBACK_PATH = os.path.join(MODELS_DIR, "fallback_lr.pkl")
 TESTDATA_PATH = os.path.join(MODELS_DIR, "test_data.npz")
 
 def load_data(csv_path="data/healthcare-dataset-stroke-data.csv"):
@@ -45,6 +48,24 @@ def build_model(input_dim):
     )
     return model
 
+def split_and_resample(X_proc, y):
+    # train-test split (stratify to preserve class imbalance)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X_proc, y, test_size=0.2, random_state=42, stratify=y
+    )
+
+    # handle imbalance on training set using SMOTE
+    sm = SMOTE(random_state=42)
+    X_train_res, y_train_res = sm.fit_resample(X_train, y_train)
+    return X_train_res, y_train_res, X_test, y_test
+
+def train_fallback(X_train_res, y_train_res):
+    # fit on the same SMOTE-resampled data as the DNN so both models output
+    # probabilities on the same (resampled) scale and can be served interchangeably
+    clf = LogisticRegression(max_iter=1000)
+    clf.fit(X_train_res, y_train_res)
+    return clf
+
 def main():
     # load raw data
     X, y = load_data()
@@ -55,14 +76,8 @@ def main():
     # preprocess full dataset then split (to avoid information leak from test)
     X_proc = preproc.transform(X)
 
-    # train-test split (stratify to preserve class imbalance)
-    X_train, X_test, y_train, y_test = train_test_split(
-        X_proc, y, test_size=0.2, random_state=42, stratify=y
-    )
-
-    # handle imbalance on training set using SMOTE
-    sm = SMOTE(random_state=42)
-    X_train_res, y_train_res = sm.fit_resample(X_train, y_train)
+    # stratified train-test split, SMOTE on the training part
+    X_train_res, y_train_res, X_test, y_test = split_and_resample(X_proc, y)
 
     # build, train
     model = build_model(X_train_res.shape[1])
@@ -87,6 +102,11 @@ def main():
         model.save(MODEL_PATH)
     print(f"Model saved to: {MODEL_PATH}")
 
+    # lightweight fallback used by the API/GUI when TensorFlow is unavailable or slow
+    fallback = train_fallback(X_train_res, y_train_res)
+    joblib.dump(fallback, FALLBACK_PATH)
+    print(f"Fallback model saved to: {FALLBACK_PATH}")
+
     # save test set for evaluation
     np.savez(TESTDATA_PATH, X_test=X_test, y_test=y_test)
     print(f"Test split saved to: {TESTDATA_PATH}")
@@ -0,0 +1,20 @@
+# src/train_fallback.py
+"""
+Fit only the logistic-regression fallback, without retraining the DNN.
+Rebuilds the same deterministic split and SMOTE resampling as train_dnn.py
+and saves models/fallback_lr.pkl.
+"""
+import joblib
+from train_dnn import load_data, split_and_resample, train_fallback, PREPROC_PATH, FALLBACK_PATH
+
+def main():
+    X, y = load_data()
+    preproc = joblib.load(PREPROC_PATH)
+    X_train_res, y_train_res, _, _ = split_and_resample(preproc.transform(X), y)
+
+    fallback = train_fallback(X_train_res, y_train_res)
+    joblib.dump(fallback, FALLBACK_PATH)
+    print(f"Fallback model saved to: {FALLBACK_PATH}")
+
+if __name__ == "__main__":
+    main()
@@ -35,6 +35,13 @@ class StrokeRiskGUI:
         except Exception as e:
             print(f"Error loading model: {e}")
             self.model = None
+
+        try:
+            self.fallback_model = joblib.load("models/fallback_lr.pkl")
+            print("Fallback model loaded successfully")
+        except Exception as e:
+            print(f"Error loading fallback model: {e}")
+            self.fallback_model = None
     
     def create_widgets(self):
         # Title
@@ -146,6 +153,9 @@ class StrokeRiskGUI:
                 prediction = self.model.predict(X, verbose=0)
                 risk = float(prediction[0][0])
                 method = "Neural Network Model"
+            elif self.fallback_model is not None:
+                risk = float(self.fallback_model.predict_proba(X)[0, 1])
+                method = "Logistic Regression Fallback (Neural Network unavailable)"
             else:
                 # Fallback calculation
                 risk = self.calculate_simple_risk(data)
@@ -175,7 +185,7 @@ Recommendation:
             messagebox.showerror("Error", f"Prediction failed: {str(e)}")
     
     def calculate_simple_risk(self, data):
-        """Simple risk calculation fallback"""
+        """Simple risk calculation, used only if no model could be loaded"""
         risk = 0.1
         
         if data["age"] > 65: risk += 0.3
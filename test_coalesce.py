@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Check request coalescing (src/coalesce.py) with real threads
+"""
+import sys
+import threading
+import time
+
+sys.path.insert(0, "src")
+from coalesce import SingleFlight
+
+print("=== Testing Request Coalescing ===")
+
+N = 10
+
+def run_concurrently(sf, key, fn):
+    # start N callers together; collect each caller's result or exception
+    results, errors = [], []
+    start = threading.Barrier(N)
+
+    def caller():
+        start.wait()
+        try:
+            results.append(sf.do(key, fn))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=caller) for _ in range(N)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results, errors
+
+# N concurrent calls on one key run fn once and all get its result
+sf = SingleFlight()
+calls = []
+def slow_predict():
+    calls.append(1)
+    time.sleep(0.2)
+    return 0.42
+
+results, errors = run_concurrently(sf, "patient", slow_predict)
+assert not errors, errors
+assert results == [0.42] * N, results
+assert len(calls) == 1, len(calls)
+stats = sf.stats()
+assert stats["requests"] == N and stats["coalesced_requests"] == N - 1, stats
+assert stats["inflight"] == 0, stats
+print(f"SUCCESS: {N} concurrent calls ran fn once, {stats['coalesced_requests']} coalesced")
+
+# If the leader raises, every follower gets the error and the key is cleared
+class PredictionError(Exception):
+    def __init__(self, *, detail):
+        super().__init__(detail)
+        self.detail = detail
+
+sf = SingleFlight()
+def failing_predict():
+    time.sleep(0.2)
+    raise PredictionError(detail="model failed")
+
+results, errors = run_concurrently(sf, "patient", failing_predict)
+assert not results, results
+assert len(errors) == N, len(errors)
+assert all(isinstance(e, PredictionError) and e.detail == "model failed" for e in errors)
+# followers raise their own copy, chained to the leader's exception
+assert len({id(e) for e in errors}) == N
+leader_errors = [e for e in errors if e.__cause__ is None]
+assert len(leader_errors) == 1
+assert all(e.__cause__ is leader_errors[0] for e in errors if e.__cause__ is not None)
+assert sf.stats()["inflight"] == 0
+print(f"SUCCESS: leader error reached all {N} callers as separate exceptions")
+
+# after the failure the key is free again
+assert sf.do("patient", lambda: "recovered") == "recovered"
+print("SUCCESS: key cleared after failure")
+
+# dedupe: first index per unique key, inverse maps every row to its unique result
+sf = SingleFlight()
+first, inverse = sf.dedupe(["a", "b", "a", "c", "b", "a"])
+assert first == [0, 1, 3], first
+assert inverse == [0, 1, 0, 2, 1, 0], inverse
+assert sf.dedupe([]) == ([], [])
+stats = sf.stats()
+assert stats["batch_rows"] == 6 and stats["batch_rows_deduped"] == 3, stats
+print("SUCCESS: dedupe returns correct first/inverse and counts deduped rows")
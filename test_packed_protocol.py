@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Check that the packed request decoder produces the same features as the
+JSON path (preproc.transform on a DataFrame)
+"""
+import sys
+import joblib
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, "src")
+from packed_protocol import PackedDecoder, PackedFormatError, category_table, encode_rows, HEADER, MAGIC
+from preprocess import build_preprocessor
+
+print("=== Testing Packed Request Protocol ===")
+
+preproc = joblib.load("models/preprocessor.pkl")
+decoder = PackedDecoder(preproc)
+categories = category_table(preproc)
+
+# Real CSV rows, including rows with missing (N/A) bmi
+df = pd.read_csv("data/healthcare-dataset-stroke-data.csv").drop(columns=["id", "stroke"])
+df = pd.concat([df.head(200), df[df["bmi"].isna()].head(20)], ignore_index=True)
+records = [
+    {k: (None if pd.isna(v) else v) for k, v in rec.items()}
+    for rec in df.to_dict(orient="records")
+]
+
+# An unknown category must encode to code 255 and all-zero one-hot columns
+unknown = dict(records[0], work_type="Astronaut")
+records.append(unknown)
+df = pd.concat([df, pd.DataFrame([unknown])], ignore_index=True)
+
+X_json = preproc.transform(df)
+X_packed = decoder.decode(encode_rows(records, categories))
+assert X_packed.shape == X_json.shape, (X_packed.shape, X_json.shape)
+# numerics travel as float32, so allow float32 rounding after scaling
+max_diff = np.abs(X_packed - X_json).max()
+assert max_diff < 1e-5, max_diff
+print(f"SUCCESS: {len(records)} rows match preproc.transform (max |dX| = {max_diff:.1e})")
+print("SUCCESS: NaN bmi is median-imputed, unknown category encodes to zeros")
+
+# Malformed buffers
+good = encode_rows(records[:3], categories)
+for name, buf in [
+    ("truncated buffer", good[:-1]),
+    ("extra bytes", good + b"\0"),
+    ("bad magic", b"XXXX" + good[len(MAGIC):]),
+    ("short header", good[:HEADER.size - 1]),
+]:
+    try:
+        decoder.decode(buf)
+    except PackedFormatError:
+        print(f"SUCCESS: {name} raises PackedFormatError")
+    else:
+        raise AssertionError(f"{name} was accepted")
+
+# A preprocessor fitted with a different column order must be rejected up front
+reordered = build_preprocessor()
+name, pipe, cols = reordered.transformers[1]
+reordered.transformers[1] = (name, pipe, list(reversed(cols)))
+reordered.fit(pd.read_csv("data/healthcare-dataset-stroke-data.csv").drop(columns=["id", "stroke"]))
+try:
+    PackedDecoder(reordered)
+except ValueError:
+    print("SUCCESS: mismatched preprocessor columns rejected at startup")
+else:
+    raise AssertionError("reordered preprocessor was accepted")